@@ -0,0 +1,84 @@
+# benchmarks/import_time.py
+# ============================================================================
+# Cold-start guard: đo thời gian `import app` bằng `python -X importtime`
+# ---------------------------------------------------------------------------
+#  python benchmarks/import_time.py            # so với baseline, exit 1 nếu chậm hơn
+#  python benchmarks/import_time.py --update   # ghi lại baseline
+#  ✦ Lấy trung vị của nhiều lần chạy (mỗi lần một tiến trình mới)
+#  ✦ Báo lỗi nếu module nặng (gradio, pandas, ...) bị import lúc khởi động
+# ---------------------------------------------------------------------------
+
+import argparse, json, os, statistics, subprocess, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "import_time.json")
+HEAVY_MODULES = ["gradio", "pandas", "requests", "aiohttp", "elevenlabs", "numpy"]
+
+def measure_once(code="import app"):
+    """Run code in a fresh interpreter and return ({module: cumulative_us}, app_total_us)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # dòng tiêu đề
+        name = parts[2].strip()
+        modules[name] = max(cumulative, modules.get(name, 0))
+    return modules, modules.get("app", 0)
+
+def measure(runs):
+    startup, _ = measure_once("pass")  # module của interpreter/site, không tính cho app
+    totals, modules = [], {}
+    for _ in range(runs):
+        modules, total = measure_once()
+        totals.append(total)
+    heavy = sorted(m for m in modules if m.split(".")[0] in HEAVY_MODULES)
+    top = sorted(((m, us) for m, us in modules.items() if m != "app" and "." not in m and m not in startup), key=lambda x: -x[1])[:10]
+    return {
+        "app_import_ms": round(statistics.median(totals) / 1000, 1),
+        "runs": runs,
+        "heavy_modules": sorted({m.split(".")[0] for m in heavy}),
+        "top_modules_ms": {m: round(us / 1000, 1) for m, us in top},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Track `import app` cold-start time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--update", action="store_true", help="write the result as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor vs. baseline")
+    parser.add_argument("--slack-ms", type=float, default=25.0, help="absolute slack added to the allowed time")
+    args = parser.parse_args()
+
+    result = measure(args.runs)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    if args.update:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"✅ Đã ghi baseline: {BASELINE}")
+        return 0
+
+    failures = []
+    if result["heavy_modules"]:
+        failures.append(f"module nặng bị import lúc khởi động: {', '.join(result['heavy_modules'])}")
+    if os.path.exists(BASELINE):
+        with open(BASELINE, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        allowed = baseline["app_import_ms"] * args.tolerance + args.slack_ms
+        if result["app_import_ms"] > allowed:
+            failures.append(f"import app {result['app_import_ms']} ms > cho phép {allowed:.1f} ms (baseline {baseline['app_import_ms']} ms)")
+    else:
+        print("ℹ️ Chưa có baseline, chạy với --update để tạo.")
+    for failure in failures:
+        print(f"❌ {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+# benchmarks/load_test.py
+# ============================================================================
+# Load test: N phiên Gradio giả lập gọi handler thật trỏ vào stub ElevenLabs
+# ---------------------------------------------------------------------------
+#  python benchmarks/load_test.py --spawn-stub --sessions 20 --duration 30
+#  python benchmarks/load_test.py --base-url http://127.0.0.1:8765 --mix tts=8,refresh=1,usage=1
+#  python benchmarks/load_test.py --spawn-stub --stub-args "--rate-429 0.05 --error-rate 0.02"
+#  ✦ Mỗi phiên có state riêng (keys/proxies/voices) như gr.State của một trình duyệt
+#  ✦ tts → tts_from_text_async, refresh → refresh_keys, usage → get_api_usage (thread như Gradio)
+#  ✦ Báo throughput và p50/p95/p99 theo từng thao tác; --json để lưu kết quả
+# ---------------------------------------------------------------------------
+
+import argparse, asyncio, json, os, random, shlex, statistics, subprocess, sys, tempfile, time, urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = "xin chào hôm nay trời đẹp chúng ta cùng nhau đọc một đoạn văn bản thử nghiệm dài vừa phải".split()
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"tts", "refresh", "usage"}
+    if unknown:
+        raise SystemExit(f"❌ Thao tác không hỗ trợ: {', '.join(sorted(unknown))}")
+    return mix
+
+def wait_ready(base_url, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/_stub/stats", timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+def percentiles(samples):
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    if len(samples) == 1:
+        cuts = samples * 99
+    else:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": round(cuts[49] * 1000, 1), "p95": round(cuts[94] * 1000, 1), "p99": round(cuts[98] * 1000, 1), "max": round(max(samples) * 1000, 1)}
+
+class Session:
+    """One simulated browser session holding its own gr.State values"""
+    def __init__(self, app, sid, args):
+        self.app = app
+        self.sid = sid
+        self.args = args
+        self.random = random.Random(args.seed + sid if args.seed is not None else None)
+        self.keys = app.KeyRegistry({f"sk_load_{sid:03d}_{i:02d}{'0' * 24}": {} for i in range(args.keys)})
+        self.proxies = app.ProxyRegistry()
+        self.voices = app.load_default_voices()
+        self.voice = next(iter(self.voices), None)
+        self.counter = 0
+
+    def text(self):
+        self.counter += 1
+        words = [self.random.choice(WORDS) for _ in range(max(1, self.args.chars // 5))]
+        # tiền tố riêng để cache (nếu bật) không che mất lời gọi API
+        return f"Phiên {self.sid} lần {self.counter}. " + " ".join(words) + "."
+
+    async def tts(self):
+        file_path, status, _, keys = await self.app.tts_from_text_async(
+            self.text(), self.voice, self.app.DEFAULT_MODEL, self.args.format, None, True, True,
+            self.voices, self.keys, self.proxies, self.args.long, self.app.TTS_MAX_WORKERS)
+        self.keys = keys
+        return bool(file_path), status
+
+    async def refresh(self):
+        last = None
+        async for last in self.app.refresh_keys(self.keys, self.proxies):
+            pass
+        self.keys = last[-1]
+        bad = [v.get("status", "") for v in self.keys.values() if not v.get("status", "").startswith("✅")]
+        return not bad, bad[0] if bad else "✅"
+
+    async def usage(self):
+        key = self.random.choice(list(self.keys))
+        result = await asyncio.to_thread(self.app.get_api_usage, key, True, self.proxies)
+        return result.get("status", "").startswith("✅"), result.get("status", "")
+
+async def run_session(session, mix, stop_at, iterations, results):
+    ops, weights = list(mix), list(mix.values())
+    done = 0
+    while time.time() < stop_at and (not iterations or done < iterations):
+        op = session.random.choices(ops, weights)[0]
+        t0 = time.perf_counter()
+        try:
+            ok, status = await getattr(session, op)()
+        except Exception as e:
+            ok, status = False, f"{type(e).__name__}: {e}"
+        entry = results.setdefault(op, {"latencies": [], "errors": 0, "statuses": {}})
+        entry["latencies"].append(time.perf_counter() - t0)
+        if not ok:
+            entry["errors"] += 1
+            short = str(status)[:60]
+            entry["statuses"][short] = entry["statuses"].get(short, 0) + 1
+        done += 1
+        if session.args.think_ms:
+            await asyncio.sleep(session.random.uniform(0, 2 * session.args.think_ms) / 1000)
+
+async def run(app, args):
+    sessions = [Session(app, sid, args) for sid in range(args.sessions)]
+    await asyncio.gather(*(s.refresh() for s in sessions))  # nạp credit ban đầu, không tính vào kết quả
+    results = {}
+    mix = parse_mix(args.mix)
+    t0 = time.perf_counter()
+    stop_at = time.time() + args.duration
+    await asyncio.gather(*(run_session(s, mix, stop_at, args.iterations, results) for s in sessions))
+    wall = time.perf_counter() - t0
+    total = sum(len(r["latencies"]) for r in results.values())
+    report = {
+        "sessions": args.sessions,
+        "wall_s": round(wall, 2),
+        "ops": total,
+        "throughput_ops_s": round(total / wall, 2) if wall else 0,
+        "operations": {},
+    }
+    for op, r in sorted(results.items()):
+        report["operations"][op] = {
+            "count": len(r["latencies"]),
+            "errors": r["errors"],
+            "throughput_ops_s": round(len(r["latencies"]) / wall, 2) if wall else 0,
+            "latency_ms": percentiles(r["latencies"]),
+            "error_statuses": dict(sorted(r["statuses"].items(), key=lambda x: -x[1])[:5]),
+        }
+    return report
+
+def print_report(report):
+    print(f"\n{report['sessions']} phiên, {report['ops']} thao tác trong {report['wall_s']} s → {report['throughput_ops_s']} ops/s")
+    print(f"{'op':<10}{'count':>8}{'err':>6}{'ops/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for op, r in report["operations"].items():
+        lat = r["latency_ms"]
+        print(f"{op:<10}{r['count']:>8}{r['errors']:>6}{r['throughput_ops_s']:>9}{lat['p50']:>10}{lat['p95']:>10}{lat['p99']:>10}{lat['max']:>10}")
+        for status, n in r["error_statuses"].items():
+            print(f"{'':<10}  ✗ {n}× {status}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the app handlers concurrently against an ElevenLabs stub")
+    parser.add_argument("--base-url", default=None, help="ElevenLabs API base (default: the spawned stub)")
+    parser.add_argument("--spawn-stub", action="store_true", help="start benchmarks/stub_server.py for the run")
+    parser.add_argument("--stub-port", type=int, default=8765)
+    parser.add_argument("--stub-args", default="", help="extra arguments passed to stub_server.py")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--keys", type=int, default=3, help="API keys per session")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds to run")
+    parser.add_argument("--iterations", type=int, default=0, help="stop each session after this many ops (0 = until duration)")
+    parser.add_argument("--mix", default="tts=8,refresh=1,usage=1", help="operation weights")
+    parser.add_argument("--chars", type=int, default=300, help="approximate characters per tts request")
+    parser.add_argument("--long", action="store_true", help="use long mode (chunked, parallel) for tts")
+    parser.add_argument("--format", default=None, help="output format (default: ELEVENLABS_OUTPUT_FORMAT)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause between a session's operations")
+    parser.add_argument("--cache", action="store_true", help="keep the audio cache enabled")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="write the report to this file")
+    args = parser.parse_args()
+
+    base_url = args.base_url or f"http://127.0.0.1:{args.stub_port}"
+    stub = None
+    if args.spawn_stub:
+        stub = subprocess.Popen([sys.executable, os.path.join(ROOT, "benchmarks", "stub_server.py"), "--port", str(args.stub_port)] + shlex.split(args.stub_args))
+        if not wait_ready(base_url):
+            stub.terminate()
+            print("❌ Stub không khởi động được")
+            return 1
+    # cấu hình phải có trước khi import app (hằng số đọc từ env lúc import)
+    os.environ["ELEVENLABS_API_BASE"] = base_url
+    os.environ.setdefault("TTS_OUTPUT_DIR", tempfile.mkdtemp(prefix="tts_load_"))
+    if not args.cache:
+        os.environ["TTS_CACHE_MAX_MB"] = "0"
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import app
+
+    try:
+        report = asyncio.run(run(app, args))
+    finally:
+        if stub:
+            stub.terminate()
+            stub.wait(timeout=5)
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"✅ Đã ghi kết quả: {args.json_path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# benchmarks/stub_server.py
+# ============================================================================
+# Máy chủ giả lập ElevenLabs cho load test – không tốn credit thật
+# ---------------------------------------------------------------------------
+#  python benchmarks/stub_server.py --port 8765 --latency-ms 300 --error-rate 0.02 --rate-429 0.05
+#  ELEVENLABS_API_BASE=http://127.0.0.1:8765 python app.py
+#  ✦ POST /v1/text-to-speech/{voice_id}[/stream]  → audio giả (MP3 câm / PCM 0), trừ ký tự
+#  ✦ GET  /v1/user/subscription                   → character_count/limit theo từng key
+#  ✦ GET  /v1/voices                               → --voices voice giả, có ETag/Last-Modified (304 khi không đổi)
+#  ✦ Độ trễ = latency + per-char × số ký tự ± jitter; lỗi 500 và 429 (Retry-After) theo tỉ lệ
+# ---------------------------------------------------------------------------
+
+import argparse, asyncio, random, sys
+
+from aiohttp import web
+
+# khung MPEG-1 Layer III 128 kbps / 44.1 kHz không padding, side info = 0 → giải mã ra im lặng
+MP3_SILENT_FRAME = b"\xff\xfb\x90\x64" + bytes(413)
+MP3_FRAME_SECONDS = 1152 / 44100
+
+class StubState:
+    def __init__(self, args):
+        self.args = args
+        self.used = {}
+        self.requests = 0
+        self.random = random.Random(args.seed)
+        self.voices = fake_voices(args.voices)
+        self.voices_etag = f'"stub-{args.voices}"'
+        self.voices_modified = "Mon, 07 Jul 2025 00:00:00 GMT"
+
+    def latency(self, chars=0):
+        a = self.args
+        delay = a.latency_ms + a.per_char_ms * chars + self.random.uniform(-a.jitter_ms, a.jitter_ms)
+        return max(0.0, delay) / 1000
+
+    def failure(self):
+        """None, or a ready error response drawn from the configured 429/500 rates"""
+        roll = self.random.random()
+        if roll < self.args.rate_429:
+            return web.json_response({"detail": {"status": "too_many_concurrent_requests"}}, status=429, headers={"Retry-After": str(self.args.retry_after)})
+        if roll < self.args.rate_429 + self.args.error_rate:
+            return web.json_response({"detail": {"status": "internal_error"}}, status=500)
+        return None
+
+def fake_voices(count):
+    genders, accents = ("male", "female"), ("american", "british", "vietnamese", "australian")
+    return [
+        {"voice_id": f"stub{i:016d}", "name": f"Stub Voice {i}", "category": "generated" if i % 3 else "cloned",
+         "labels": {"gender": genders[i % 2], "accent": accents[i % 4]}}
+        for i in range(count)
+    ]
+
+def fake_audio(text, output_format):
+    """Roughly real-sized audio for text at ~15 chars/s of speech"""
+    seconds = max(0.5, len(text) / 15)
+    if output_format.startswith(("pcm_", "ulaw_")):
+        rate = int(output_format.split("_")[1])
+        return bytes(int(seconds * rate) * (1 if output_format.startswith("ulaw_") else 2))
+    frames = int(seconds / MP3_FRAME_SECONDS) + 1
+    return MP3_SILENT_FRAME * frames
+
+async def text_to_speech(request):
+    state = request.app["state"]
+    state.requests += 1
+    api_key = request.headers.get("xi-api-key", "")
+    if not api_key or api_key.startswith("bad"):
+        return web.json_response({"detail": {"status": "invalid_api_key"}}, status=401)
+    try:
+        body = await request.json()
+    except ValueError:
+        return web.json_response({"detail": "invalid json"}, status=400)
+    text = body.get("text", "")
+    if state.used.get(api_key, 0) + len(text) > state.args.quota:
+        return web.json_response({"detail": {"status": "quota_exceeded"}}, status=401)
+    error = state.failure()
+    if error is not None:
+        await asyncio.sleep(state.latency())
+        return error
+    output_format = request.query.get("output_format", "mp3_44100_128")
+    audio = fake_audio(text, output_format)
+    state.used[api_key] = state.used.get(api_key, 0) + len(text)
+    content_type = "application/octet-stream" if output_format.startswith(("pcm_", "ulaw_")) else "audio/mpeg"
+    if not request.path.endswith("/stream"):
+        await asyncio.sleep(state.latency(len(text)))
+        return web.Response(body=audio, content_type=content_type)
+    # stream: byte đầu tiên sau latency, phần còn lại rải đều theo per-char
+    await asyncio.sleep(state.latency())
+    response = web.StreamResponse(headers={"Content-Type": content_type})
+    await response.prepare(request)
+    pieces = max(1, len(audio) // 16384)
+    step = len(audio) // pieces + 1
+    pause = state.args.per_char_ms * len(text) / 1000 / pieces
+    for i in range(0, len(audio), step):
+        await response.write(audio[i:i + step])
+        await asyncio.sleep(pause)
+    await response.write_eof()
+    return response
+
+async def subscription(request):
+    state = request.app["state"]
+    state.requests += 1
+    api_key = request.headers.get("xi-api-key", "")
+    if not api_key or api_key.startswith("bad"):
+        return web.json_response({"detail": {"status": "invalid_api_key"}}, status=401)
+    error = state.failure()
+    await asyncio.sleep(state.latency())
+    if error is not None:
+        return error
+    return web.json_response({"tier": "stub", "character_count": state.used.get(api_key, 0), "character_limit": state.args.quota})
+
+async def voices(request):
+    state = request.app["state"]
+    state.requests += 1
+    api_key = request.headers.get("xi-api-key", "")
+    if not api_key or api_key.startswith("bad"):
+        return web.json_response({"detail": {"status": "invalid_api_key"}}, status=401)
+    await asyncio.sleep(state.latency())
+    validators = {"ETag": state.voices_etag, "Last-Modified": state.voices_modified}
+    if request.headers.get("If-None-Match") == state.voices_etag or request.headers.get("If-Modified-Since") == state.voices_modified:
+        return web.Response(status=304, headers=validators)
+    return web.json_response({"voices": state.voices}, headers=validators)
+
+async def stats(request):
+    state = request.app["state"]
+    return web.json_response({"requests": state.requests, "keys": len(state.used), "characters": sum(state.used.values())})
+
+def make_app(args):
+    app = web.Application(client_max_size=4 * 1024 * 1024)
+    app["state"] = StubState(args)
+    app.router.add_post("/v1/text-to-speech/{voice_id}", text_to_speech)
+    app.router.add_post("/v1/text-to-speech/{voice_id}/stream", text_to_speech)
+    app.router.add_get("/v1/user/subscription", subscription)
+    app.router.add_get("/v1/voices", voices)
+    app.router.add_get("/_stub/stats", stats)
+    return app
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local ElevenLabs stand-in for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=250.0, help="base latency of every request")
+    parser.add_argument("--per-char-ms", type=float, default=0.5, help="extra synthesis latency per character")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429")
+    parser.add_argument("--quota", type=int, default=1_000_000, help="character_limit of every key")
+    parser.add_argument("--voices", type=int, default=40, help="voices listed by GET /v1/voices")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"🧪 Stub ElevenLabs tại http://{args.host}:{args.port}", flush=True)
+    web.run_app(make_app(args), host=args.host, port=args.port, print=None, access_log=None)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())